@@ -2,12 +2,20 @@
 
 Split off _filter_design.py
 """
+import cmath
+import functools
 import warnings
 import math
 from math import pi
 
+import numpy
+try:
+    import scipy.special
+    _scipy_available = True
+except ImportError:
+    _scipy_available = False
+
 import cupy
-from cupyx.scipy.special import binom as comb
 import cupyx.scipy.special as special
 
 
@@ -19,21 +27,18 @@ class BadCoefficients(UserWarning):
 def _trim_zeros(filt, trim='fb'):
     # https://github.com/numpy/numpy/blob/v1.24.0/numpy/lib/function_base.py#L1800-L1850
 
-    first = 0
-    if 'f' in trim:
-        for i in filt:
-            if i != 0.:
-                break
-            else:
-                first = first + 1
-
-    last = len(filt)
-    if 'f' in trim:
-        for i in filt[::-1]:
-            if i != 0.:
-                break
-            else:
-                last = last - 1
+    nonzero = cupy.nonzero(filt)[0]
+    if nonzero.size == 0:
+        return filt[:0]
+
+    # Fetch both ends in a single device-to-host transfer
+    first, last = nonzero[[0, -1]].tolist()
+    if 'f' not in trim:
+        first = 0
+    if 'b' in trim:
+        last = last + 1
+    else:
+        last = len(filt)
     return filt[first:last]
 
 
@@ -67,18 +72,29 @@ def _align_nums(nums):
 
     except ValueError:
         nums = [cupy.atleast_1d(num) for num in nums]
-        max_width = max(num.size for num in nums)
+        widths = numpy.array([num.size for num in nums])
+        max_width = int(widths.max())
 
         # pre-allocate
         aligned_nums = cupy.zeros((len(nums), max_width))
 
-        # Create numerators with padded zeros
-        for index, num in enumerate(nums):
-            aligned_nums[index, -num.size:] = num
+        # Create numerators with padded zeros: scatter all of them at once,
+        # each right-aligned in its own row of the flattened array
+        starts = numpy.cumsum(widths) - widths
+        offsets = (numpy.arange(len(nums)) * max_width + max_width - widths
+                   - starts)
+        idx = numpy.arange(widths.sum()) + numpy.repeat(offsets, widths)
+        aligned_nums.ravel()[cupy.asarray(idx)] = cupy.concatenate(
+            [num.ravel() for num in nums])
 
         return aligned_nums
 
 
+@cupy.fuse()
+def _abs_max_columns(x):
+    return cupy.max(cupy.abs(x), axis=0)
+
+
 def normalize(b, a):
     """Normalize numerator/denominator of a continuous-time transfer function.
 
@@ -132,12 +148,8 @@ def normalize(b, a):
     num, den = num / den[0], den / den[0]
 
     # Count numerator columns that are all zero
-    leading_zeros = 0
-    for col in num.T:
-        if cupy.allclose(col, 0, atol=1e-14):
-            leading_zeros += 1
-        else:
-            break
+    col_zero = _abs_max_columns(num) <= 1e-14
+    leading_zeros = int(cupy.cumprod(col_zero, dtype=cupy.int64).sum())
 
     # Trim leading zeros of numerator
     if leading_zeros > 0:
@@ -155,6 +167,122 @@ def normalize(b, a):
     return num, den
 
 
+# Filter orders repeat across design calls, so the host tables below
+# depend on the order only and are memoized; they are read-only.
+
+@cupy.memoize()
+def _pascal(M):
+    """Host table of binomial coefficients, ``C[n, k] = comb(n, k)``."""
+    C = numpy.zeros((M + 1, M + 1))
+    for n in range(M + 1):
+        C[n, :n + 1] = [math.comb(n, k) for k in range(n + 1)]
+    C.flags.writeable = False
+    return C
+
+
+@cupy.memoize()
+def _bilinear_matrix(M):
+    """Host matrix of coefficients of ``(1 - x)**i * (1 + x)**(M - i)``.
+
+    ``T[i, j]`` is the coefficient of ``x**j``, so that the whole bilinear
+    expansion reduces to a single matrix product instead of per-coefficient
+    ``binom`` kernel launches.
+    """
+    # Powers of (1 - x) and (1 + x) by repeated polynomial multiplication,
+    # kept in exact integer (object) arithmetic until the final rounding
+    one = numpy.ones(1, dtype=object)
+    minus, plus = [one], [one]
+    for _ in range(M):
+        minus.append(numpy.convolve(minus[-1], numpy.array([1, -1], object)))
+        plus.append(numpy.convolve(plus[-1], numpy.array([1, 1], object)))
+
+    T = numpy.array([numpy.convolve(minus[i], plus[M - i])
+                     for i in range(M + 1)], dtype=float)
+    T.flags.writeable = False
+    return T
+
+
+def _lp2bp_matrix(n, ma, wo, bw):
+    """Host matrix mapping reversed ``lp2bp`` coefficients to the output.
+
+    The input coefficient of ``s**i`` contributes
+    ``comb(i, k) * wo**(2*(i - k)) / bw**i`` to the output coefficient of
+    ``s**(ma - i + 2*k)``; the output is in descending order.
+    """
+    C = _pascal(n)
+    wosq = wo * wo
+    wosq_pow = [wosq ** t for t in range(n + 1)]
+    bw_pow = [bw ** t for t in range(n + 1)]
+    Q = numpy.zeros((n + 1, n + ma + 1))
+    for i in range(n + 1):
+        for k in range(i + 1):
+            Q[i, n + i - 2 * k] = C[i, k] * wosq_pow[i - k] / bw_pow[i]
+    return Q
+
+
+def _lp2bs_matrix(n, M, wo, bw):
+    """Host matrix mapping reversed ``lp2bs`` coefficients to the output.
+
+    The input coefficient of ``s**i`` contributes
+    ``comb(M - i, k) * wo**(2*(M - i - k)) * bw**i`` to the output
+    coefficient of ``s**(i + 2*k)``; the output is in descending order.
+    """
+    C = _pascal(M)
+    wosq = wo * wo
+    wosq_pow = [wosq ** t for t in range(M + 1)]
+    bw_pow = [bw ** t for t in range(n + 1)]
+    Q = numpy.zeros((n + 1, 2 * M + 1))
+    for i in range(n + 1):
+        for k in range(M - i + 1):
+            Q[i, 2 * M - i - 2 * k] = (C[M - i, k] *
+                                       wosq_pow[M - i - k] * bw_pow[i])
+    return Q
+
+
+# Orders up to which `bilinear` uses a kernel specialized for the order,
+# with the expansion matrix baked into constant memory
+_BILINEAR_KERNEL_MAX_ORDER = 32
+
+_BILINEAR_KERNEL = r'''
+__constant__ double bilinear_T[{size}] = {{{table}}};
+
+extern "C" __global__ void {name}(
+        const double* b, int nb, const double* a, int na, double fs2,
+        double* bprime, double* aprime) {{
+    int j = threadIdx.x;
+    if (j > {M}) {{
+        return;
+    }}
+    double w = 1.0;
+    double val_b = 0.0;
+    double val_a = 0.0;
+    #pragma unroll
+    for (int i = 0; i <= {M}; i++) {{
+        double t = w * bilinear_T[i * {M1} + j];
+        if (i < nb) {{
+            val_b += b[nb - 1 - i] * t;
+        }}
+        if (i < na) {{
+            val_a += a[na - 1 - i] * t;
+        }}
+        w *= fs2;
+    }}
+    bprime[j] = val_b;
+    aprime[j] = val_a;
+}}
+'''
+
+
+@cupy.memoize(for_each_device=True)
+def _get_bilinear_kernel(M):
+    """Generate a `bilinear` kernel for filters of order `M`."""
+    table = ', '.join(repr(float(v)) for v in _bilinear_matrix(M).ravel())
+    name = f'cupyx_scipy_signal_bilinear_{M}'
+    code = _BILINEAR_KERNEL.format(size=(M + 1) ** 2, table=table, name=name,
+                                   M=M, M1=M + 1)
+    return cupy.RawKernel(code, name)
+
+
 def _relative_degree(z, p):
     """
     Return relative degree of transfer function from zeros and poles
@@ -167,6 +295,29 @@ def _relative_degree(z, p):
         return degree
 
 
+def _bilinear_zpk_dtypes(z, p):
+    """Cast zeros and poles to the result dtypes of `bilinear_zpk`.
+
+    As in SciPy, the poles keep their own precision (integers become
+    float64), while the zeros are joined with float64 ``-1`` entries and
+    thus promoted to at least float64.
+    """
+    if p.dtype.kind not in 'fc':
+        p = p.astype(cupy.float64)
+    z = z.astype(cupy.promote_types(z.dtype, cupy.float64), copy=False)
+    return z, p
+
+
+_bilinear_zpk_kernel = cupy.ElementwiseKernel(
+    'T x, T fs2',
+    'T y, T dx',
+    '''
+    dx = fs2 - x;
+    y = (fs2 + x) / dx;
+    ''',
+    'cupyx_scipy_signal_bilinear_zpk')
+
+
 def bilinear_zpk(z, p, k, fs):
     r"""
     Return a digital IIR filter from an analog one using a bilinear transform.
@@ -210,15 +361,19 @@ def bilinear_zpk(z, p, k, fs):
 
     fs2 = 2.0 * fs
 
-    # Bilinear transform the poles and zeros
-    z_z = (fs2 + z) / (fs2 - z)
-    p_z = (fs2 + p) / (fs2 - p)
+    z, p = _bilinear_zpk_dtypes(z, p)
 
     # Any zeros that were at infinity get moved to the Nyquist frequency
-    z_z = cupy.append(z_z, -cupy.ones(degree))
+    z_z = cupy.empty(z.size + degree, dtype=z.dtype)
+    z_z[z.size:] = -1
+
+    # Bilinear transform the poles and zeros
+    dz = cupy.empty_like(z)
+    _bilinear_zpk_kernel(z, fs2, z_z[:z.size], dz)
+    p_z, dp = _bilinear_zpk_kernel(p, fs2)
 
     # Compensate for gain change
-    k_z = k * (cupy.prod(fs2 - z) / cupy.prod(fs2 - p)).real
+    k_z = k * float((cupy.prod(dz) / cupy.prod(dp)).real)
 
     return z_z, p_z, k_z
 
@@ -327,20 +482,56 @@ def lp2hp_zpk(z, p, k, wo=1.0):
 
     degree = _relative_degree(z, p)
 
+    # If lowpass had zeros at infinity, inverting moves them to origin.
+    z_hp = cupy.zeros(z.size + degree,
+                      dtype=cupy.promote_types(z.dtype, cupy.float64))
+
     # Invert positions radially about unit circle to convert LPF to HPF
     # Scale all points radially from origin to shift cutoff frequency
-    z_hp = wo / z
+    cupy.divide(wo, z, out=z_hp[:z.size])
     p_hp = wo / p
 
-    # If lowpass had zeros at infinity, inverting moves them to origin.
-    z_hp = cupy.append(z_hp, cupy.zeros(degree))
-
     # Cancel out gain change caused by inversion
-    k_hp = k * cupy.real(cupy.prod(-z) / cupy.prod(-p))
+    k_hp = k * float(cupy.real(cupy.prod(-z) / cupy.prod(-p)))
 
     return z_hp, p_hp, k_hp
 
 
+def _band_shift(x, wo, plus, minus):
+    # Duplicate x and shift it to x +/- sqrt(x**2 - wo**2); traced by the
+    # fused callers below, separately for each input dtype.
+    if x.dtype.kind == 'c':
+        # Square root needs to produce complex result, not NaN
+        x = x.astype(cupy.complex128)
+        sq = cupy.sqrt(x * x - wo * wo)
+        plus[:] = x + sq
+        minus[:] = x - sq
+    else:
+        # The discriminant of a real x is real: take a real square root,
+        # placed on the imaginary axis when negative, with the sign that
+        # the complex square root of x**2 - wo**2 - 0j*x would give.
+        x = x.astype(cupy.float64)
+        disc = x * x - wo * wo
+        sq = cupy.sqrt(cupy.abs(disc))
+        re = cupy.where(disc >= 0, sq, 0.0)
+        im = cupy.where(disc >= 0, 0.0, cupy.copysign(sq, x))
+        plus[:] = (x + re) + 1j * im
+        minus[:] = (x - re) - 1j * im
+
+
+@cupy.fuse()
+def _lp2bp_shift(x, scale, wo, plus, minus):
+    _band_shift(x * scale, wo, plus, minus)
+
+
+@cupy.fuse()
+def _lp2bs_shift(x, scale, wo, plus, minus):
+    if x.dtype.kind == 'c':
+        # Invert directly in complex128 rather than casting the quotient
+        x = x.astype(cupy.complex128)
+    _band_shift(scale / x, wo, plus, minus)
+
+
 def lp2bp_zpk(z, p, k, wo=1.0, bw=1.0):
     r"""
     Transform a lowpass filter prototype to a bandpass filter.
@@ -396,22 +587,15 @@ def lp2bp_zpk(z, p, k, wo=1.0, bw=1.0):
 
     degree = _relative_degree(z, p)
 
-    # Scale poles and zeros to desired bandwidth
-    z_lp = z * bw/2
-    p_lp = p * bw/2
-
-    # Square root needs to produce complex result, not NaN
-    z_lp = z_lp.astype(complex)
-    p_lp = p_lp.astype(complex)
-
-    # Duplicate poles and zeros and shift from baseband to +wo and -wo
-    z_bp = cupy.concatenate((z_lp + cupy.sqrt(z_lp**2 - wo**2),
-                             z_lp - cupy.sqrt(z_lp**2 - wo**2)))
-    p_bp = cupy.concatenate((p_lp + cupy.sqrt(p_lp**2 - wo**2),
-                             p_lp - cupy.sqrt(p_lp**2 - wo**2)))
-
     # Move degree zeros to origin, leaving degree zeros at infinity for BPF
-    z_bp = cupy.append(z_bp, cupy.zeros(degree))
+    n = z.size
+    z_bp = cupy.zeros(2 * n + degree, dtype=cupy.complex128)
+    p_bp = cupy.empty(2 * p.size, dtype=cupy.complex128)
+
+    # Scale poles and zeros to desired bandwidth, duplicate them and shift
+    # from baseband to +wo and -wo
+    _lp2bp_shift(z, bw/2, wo, z_bp[:n], z_bp[n:2 * n])
+    _lp2bp_shift(p, bw/2, wo, p_bp[:p.size], p_bp[p.size:])
 
     # Cancel out gain change from frequency scaling
     k_bp = k * bw**degree
@@ -474,30 +658,98 @@ def lp2bs_zpk(z, p, k, wo=1.0, bw=1.0):
 
     degree = _relative_degree(z, p)
 
-    # Invert to a highpass filter with desired bandwidth
-    z_hp = (bw/2) / z
-    p_hp = (bw/2) / p
-
-    # Square root needs to produce complex result, not NaN
-    z_hp = z_hp.astype(complex)
-    p_hp = p_hp.astype(complex)
-
-    # Duplicate poles and zeros and shift from baseband to +wo and -wo
-    z_bs = cupy.concatenate((z_hp + cupy.sqrt(z_hp**2 - wo**2),
-                             z_hp - cupy.sqrt(z_hp**2 - wo**2)))
-    p_bs = cupy.concatenate((p_hp + cupy.sqrt(p_hp**2 - wo**2),
-                             p_hp - cupy.sqrt(p_hp**2 - wo**2)))
-
     # Move any zeros that were at infinity to the center of the stopband
-    z_bs = cupy.append(z_bs, cupy.full(degree, +1j*wo))
-    z_bs = cupy.append(z_bs, cupy.full(degree, -1j*wo))
+    n = z.size
+    z_bs = cupy.empty(2 * (n + degree), dtype=cupy.complex128)
+    z_bs[2 * n:2 * n + degree] = +1j*wo
+    z_bs[2 * n + degree:] = -1j*wo
+    p_bs = cupy.empty(2 * p.size, dtype=cupy.complex128)
+
+    # Invert to a highpass filter with desired bandwidth, duplicate poles
+    # and zeros and shift from baseband to +wo and -wo
+    _lp2bs_shift(z, bw/2, wo, z_bs[:n], z_bs[n:2 * n])
+    _lp2bs_shift(p, bw/2, wo, p_bs[:p.size], p_bs[p.size:])
 
     # Cancel out gain change caused by inversion
-    k_bs = k * cupy.real(cupy.prod(-z) / cupy.prod(-p))
+    k_bs = k * float(cupy.real(cupy.prod(-z) / cupy.prod(-p)))
 
     return z_bs, p_bs, k_bs
 
 
+# ### Batched zpk transforms ###
+
+# These apply the zpk transforms above to ``F`` filters at once: zeros and
+# poles are 2-D arrays of shape ``(F, Nz)`` and ``(F, Np)``, gains are
+# length ``F`` arrays, and every filter must share the same orders. Filter
+# design sweeps can thus amortize kernel launches over the whole batch.
+
+def _batch_zpk(z, p, k):
+    """2-D zeros and poles with one row per filter, and device gains.
+
+    The zeros are broadcast against the rows of the poles, so that a
+    single set of zeros (such as an empty one) is shared by all filters.
+    """
+    z = cupy.atleast_2d(z)
+    p = cupy.atleast_2d(p)
+    z = cupy.broadcast_to(z, p.shape[:-1] + z.shape[-1:])
+    return z, p, cupy.asarray(k)
+
+
+def _bilinear_zpk_batched(z, p, k, fs):
+    """Batched version of `bilinear_zpk`; returns the gains on the device.
+    """
+    z, p, k = _batch_zpk(z, p, k)
+
+    # the transposes have one row per zero/pole
+    degree = _relative_degree(z.T, p.T)
+
+    fs2 = 2.0 * fs
+
+    z, p = _bilinear_zpk_dtypes(z, p)
+
+    nz = z.shape[-1]
+    z_z = cupy.empty((z.shape[0], nz + degree), dtype=z.dtype)
+    z_z[:, nz:] = -1
+
+    dz = cupy.empty_like(z)
+    _bilinear_zpk_kernel(z, fs2, z_z[:, :nz], dz)
+    p_z, dp = _bilinear_zpk_kernel(p, fs2)
+
+    k_z = k * (cupy.prod(dz, axis=-1) / cupy.prod(dp, axis=-1)).real
+
+    return z_z, p_z, k_z
+
+
+def _lp2lp_zpk_batched(z, p, k, wo=1.0):
+    """Batched version of `lp2lp_zpk`.
+    """
+    z, p, k = _batch_zpk(z, p, k)
+    wo = float(wo)
+
+    degree = _relative_degree(z.T, p.T)
+
+    return wo * z, wo * p, k * wo**degree
+
+
+def _lp2hp_zpk_batched(z, p, k, wo=1.0):
+    """Batched version of `lp2hp_zpk`; returns the gains on the device.
+    """
+    z, p, k = _batch_zpk(z, p, k)
+    wo = float(wo)
+
+    degree = _relative_degree(z.T, p.T)
+
+    nz = z.shape[-1]
+    z_hp = cupy.zeros((z.shape[0], nz + degree),
+                      dtype=cupy.promote_types(z.dtype, cupy.float64))
+    cupy.divide(wo, z, out=z_hp[:, :nz])
+    p_hp = wo / p
+
+    k_hp = k * cupy.real(cupy.prod(-z, axis=-1) / cupy.prod(-p, axis=-1))
+
+    return z_hp, p_hp, k_hp
+
+
 def bilinear(b, a, fs=1.0):
     r"""
     Return a digital IIR filter from an analog one using a bilinear transform.
@@ -536,31 +788,26 @@ def bilinear(b, a, fs=1.0):
     N = b.shape[0] - 1
 
     M = max(N, D)
-    Np, Dp = M, M
-
-    bprime = cupy.empty(Np + 1, float)
-    aprime = cupy.empty(Dp + 1, float)
-
-    # XXX (ev-br): worth turning into a ufunc invocation? (loops are short)
-    for j in range(Dp + 1):
-        val = 0.0
-        for i in range(N + 1):
-            bNi = b[N - i] * (2 * fs)**i
-            for k in range(i + 1):
-                for s in range(M - i + 1):
-                    if k + s == j:
-                        val += comb(i, k) * comb(M - i, s) * bNi * (-1)**k
-        bprime[j] = cupy.real(val)
-
-    for j in range(Dp + 1):
-        val = 0.0
-        for i in range(D + 1):
-            aDi = a[D - i] * (2 * fs)**i
-            for k in range(i + 1):
-                for s in range(M - i + 1):
-                    if k + s == j:
-                        val += comb(i, k) * comb(M - i, s) * aDi * (-1)**k
-        aprime[j] = cupy.real(val)
+
+    if M <= _BILINEAR_KERNEL_MAX_ORDER:
+        # Only the real parts contribute to the (real) output
+        b = cupy.ascontiguousarray(cupy.real(b), dtype=cupy.float64)
+        a = cupy.ascontiguousarray(cupy.real(a), dtype=cupy.float64)
+        bprime = cupy.empty(M + 1)
+        aprime = cupy.empty(M + 1)
+        kernel = _get_bilinear_kernel(M)
+        kernel((1,), (M + 1,),
+               (b, numpy.int32(N + 1), a, numpy.int32(D + 1),
+                numpy.float64(2 * fs), bprime, aprime))
+        return normalize(bprime, aprime)
+
+    # Row i of `T` holds (2*fs)**i * (1 - x)**i * (1 + x)**(M - i): the
+    # expansion of s**i after substitution; contract the coefficients with it
+    T = _bilinear_matrix(M) * ((2 * fs) ** numpy.arange(M + 1))[:, None]
+    T = cupy.asarray(T)
+
+    bprime = cupy.real(b[::-1] @ T[:N + 1])
+    aprime = cupy.real(a[::-1] @ T[:D + 1])
 
     return normalize(bprime, aprime)
 
@@ -611,11 +858,15 @@ def lp2lp(b, a, wo=1.0):
     d = len(a)
     n = len(b)
     M = max(d, n)
-    pwo = wo ** cupy.arange(M - 1, -1, -1)
+    # wo**(M-1), ..., wo, 1; tiny, so build it on the host by a running
+    # product rather than a pow kernel
+    pwo = numpy.full(M, wo)
+    pwo[0] = 1.0
+    pwo = numpy.cumprod(pwo)[::-1]
     start1 = max((n - d, 0))
     start2 = max((d - n, 0))
-    b = b * pwo[start1] / pwo[start2:]
-    a = a * pwo[start1] / pwo[start1:]
+    b = b * cupy.asarray(pwo[start1] / pwo[start2:])
+    a = a * cupy.asarray(pwo[start1] / pwo[start1:])
     return normalize(b, a)
 
 
@@ -735,26 +986,14 @@ def lp2bp(b, a, wo=1.0, bw=1.0):
     N = len(b) - 1
     artype = cupy.mintypecode((a.dtype, b.dtype))
     ma = max(N, D)
-    Np = N + ma
-    Dp = D + ma
-    bprime = cupy.empty(Np + 1, artype)
-    aprime = cupy.empty(Dp + 1, artype)
-    wosq = wo * wo
-    for j in range(Np + 1):
-        val = 0.0
-        for i in range(0, N + 1):
-            for k in range(0, i + 1):
-                if ma - i + 2 * k == j:
-                    val += comb(i, k) * b[N - i] * (wosq) ** (i - k) / bw ** i
-        bprime[Np - j] = val
-
-    for j in range(Dp + 1):
-        val = 0.0
-        for i in range(0, D + 1):
-            for k in range(0, i + 1):
-                if ma - i + 2 * k == j:
-                    val += comb(i, k) * a[D - i] * (wosq) ** (i - k) / bw ** i
-        aprime[Dp - j] = val
+    wo = float(wo)
+    bw = float(bw)
+
+    bprime = b[::-1] @ cupy.asarray(_lp2bp_matrix(N, ma, wo, bw))
+    aprime = a[::-1] @ cupy.asarray(_lp2bp_matrix(D, ma, wo, bw))
+
+    bprime = bprime.astype(artype, copy=False)
+    aprime = aprime.astype(artype, copy=False)
 
     return normalize(bprime, aprime)
 
@@ -808,28 +1047,14 @@ def lp2bs(b, a, wo=1.0, bw=1.0):
     N = len(b) - 1
     artype = cupy.mintypecode((a.dtype, b.dtype))
     M = max(N, D)
-    Np = M + M
-    Dp = M + M
-    bprime = cupy.empty(Np + 1, artype)
-    aprime = cupy.empty(Dp + 1, artype)
-    wosq = wo * wo
-    for j in range(Np + 1):
-        val = 0.0
-        for i in range(0, N + 1):
-            for k in range(0, M - i + 1):
-                if i + 2 * k == j:
-                    val += (comb(M - i, k) * b[N - i] *
-                            (wosq) ** (M - i - k) * bw ** i)
-        bprime[Np - j] = val
-
-    for j in range(Dp + 1):
-        val = 0.0
-        for i in range(0, D + 1):
-            for k in range(0, M - i + 1):
-                if i + 2 * k == j:
-                    val += (comb(M - i, k) * a[D - i] *
-                            (wosq) ** (M - i - k) * bw ** i)
-        aprime[Dp - j] = val
+    wo = float(wo)
+    bw = float(bw)
+
+    bprime = b[::-1] @ cupy.asarray(_lp2bs_matrix(N, M, wo, bw))
+    aprime = a[::-1] @ cupy.asarray(_lp2bs_matrix(D, M, wo, bw))
+
+    bprime = bprime.astype(artype, copy=False)
+    aprime = aprime.astype(artype, copy=False)
 
     return normalize(bprime, aprime)
 
@@ -838,6 +1063,9 @@ def lp2bs(b, a, wo=1.0, bw=1.0):
 
 # TODO (ev-br): move to a better place (_filter_design.py (?))
 
+# The prototypes only hold O(N) values, so they are built with NumPy on the
+# host and uploaded once: per-op kernel launches would dominate otherwise.
+
 def buttap(N):
     """Return (z,p,k) for analog prototype of Nth-order Butterworth filter.
 
@@ -852,11 +1080,11 @@ def buttap(N):
     if abs(int(N)) != N:
         raise ValueError("Filter order must be a nonnegative integer")
     z = cupy.array([])
-    m = cupy.arange(-N+1, N, 2)
+    m = numpy.arange(-N+1, N, 2)
     # Middle value is 0 to ensure an exactly real pole
-    p = -cupy.exp(1j * pi * m / (2 * N))
+    p = -numpy.exp(1j * pi * m / (2 * N))
     k = 1
-    return z, p, k
+    return z, cupy.asarray(p), k
 
 
 def cheb1ap(N, rp):
@@ -882,19 +1110,19 @@ def cheb1ap(N, rp):
     z = cupy.array([])
 
     # Ripple factor (epsilon)
-    eps = cupy.sqrt(10 ** (0.1 * rp) - 1.0)
-    mu = 1.0 / N * cupy.arcsinh(1 / eps)
+    eps = math.sqrt(10 ** (0.1 * rp) - 1.0)
+    mu = 1.0 / N * math.asinh(1 / eps)
 
     # Arrange poles in an ellipse on the left half of the S-plane
-    m = cupy.arange(-N+1, N, 2)
+    m = numpy.arange(-N+1, N, 2)
     theta = pi * m / (2*N)
-    p = -cupy.sinh(mu + 1j*theta)
+    p = -numpy.sinh(mu + 1j*theta)
 
-    k = cupy.prod(-p, axis=0).real
+    k = float(numpy.prod(-p, axis=0).real)
     if N % 2 == 0:
-        k = k / cupy.sqrt(1 + eps * eps)
+        k = k / math.sqrt(1 + eps * eps)
 
-    return z, p, k
+    return z, cupy.asarray(p), k
 
 
 def cheb2ap(N, rs):
@@ -918,25 +1146,25 @@ def cheb2ap(N, rs):
         return cupy.array([]), cupy.array([]), 1
 
     # Ripple factor (epsilon)
-    de = 1.0 / cupy.sqrt(10 ** (0.1 * rs) - 1)
-    mu = cupy.arcsinh(1.0 / de) / N
+    de = 1.0 / math.sqrt(10 ** (0.1 * rs) - 1)
+    mu = math.asinh(1.0 / de) / N
 
     if N % 2:
-        m = cupy.concatenate((cupy.arange(-N+1, 0, 2),
-                              cupy.arange(2, N, 2)))
+        m = numpy.concatenate((numpy.arange(-N+1, 0, 2),
+                               numpy.arange(2, N, 2)))
     else:
-        m = cupy.arange(-N+1, N, 2)
+        m = numpy.arange(-N+1, N, 2)
 
-    z = -cupy.conjugate(1j / cupy.sin(m * pi / (2.0 * N)))
+    z = -numpy.conjugate(1j / numpy.sin(m * pi / (2.0 * N)))
 
     # Poles around the unit circle like Butterworth
-    p = -cupy.exp(1j * pi * cupy.arange(-N+1, N, 2) / (2 * N))
+    p = -numpy.exp(1j * pi * numpy.arange(-N+1, N, 2) / (2 * N))
     # Warp into Chebyshev II
-    p = cupy.sinh(mu) * p.real + 1j * cupy.cosh(mu) * p.imag
+    p = math.sinh(mu) * p.real + 1j * math.cosh(mu) * p.imag
     p = 1.0 / p
 
-    k = (cupy.prod(-p, axis=0) / cupy.prod(-z, axis=0)).real
-    return z, p, k
+    k = float((numpy.prod(-p, axis=0) / numpy.prod(-z, axis=0)).real)
+    return cupy.asarray(z), cupy.asarray(p), k
 
 
 # ### Elliptic filter prototype ###
@@ -946,7 +1174,38 @@ _POW10_LOG10 = math.log(10)
 
 def _pow10m1(x):
     """10 ** x - 1 for x near 0"""
-    return cupy.expm1(_POW10_LOG10 * x)
+    return math.expm1(_POW10_LOG10 * x)
+
+
+def _ellipk_agm(mc):
+    """Complete elliptic integral of the first kind K(1 - mc)
+
+    Host scalar evaluation by the arithmetic-geometric mean,
+    K(m) = pi / (2 * agm(1, sqrt(1 - m))); taking the complementary
+    parameter keeps full accuracy for m close to 1, like ``ellipkm1``.
+    """
+    if mc == 0:
+        return math.inf
+
+    # The AGM converges quadratically: a handful of steps reach machine
+    # precision, the bound only guards against non-finite input.
+    a, b = 1.0, math.sqrt(mc)
+    for _ in range(64):
+        if abs(a - b) <= 1e-15 * a:
+            break
+        a, b = (a + b) / 2, math.sqrt(a * b)
+    # the midpoint of the last interval is the closest estimate of the AGM
+    return pi / (a + b)
+
+
+# number of terms in solving degree equation
+_ELLIPDEG_MMAX = 7
+
+# exponents of the nome in the numerator and denominator series of
+# _ellipdeg, mm * (mm + 1) for mm = 0..MMAX and mm**2 for mm = 1..MMAX+1
+_ELLIPDEG_NUM_EXPONENTS = tuple(mm * (mm + 1)
+                                for mm in range(_ELLIPDEG_MMAX + 1))
+_ELLIPDEG_DEN_EXPONENTS = tuple(mm**2 for mm in range(1, _ELLIPDEG_MMAX + 2))
 
 
 def _ellipdeg(n, m1):
@@ -963,20 +1222,16 @@ def _ellipdeg(n, m1):
     .. [1] Orfanidis, "Lecture Notes on Elliptic Filter Design",
            https://www.ece.rutgers.edu/~orfanidi/ece521/notes.pdf
     """
-    # number of terms in solving degree equation
-    _ELLIPDEG_MMAX = 7
-
-    K1 = special.ellipk(m1)
-    K1p = special.ellipkm1(m1)
+    K1 = _ellipk_agm(1 - m1)
+    K1p = _ellipk_agm(m1)
 
-    q1 = cupy.exp(-pi * K1p / K1)
+    # The order only enters through the nome q: the series themselves are
+    # fixed, straight-line sums over the tabulated exponents
+    q1 = math.exp(-pi * K1p / K1)
     q = q1 ** (1/n)
 
-    mnum = cupy.arange(_ELLIPDEG_MMAX + 1)
-    mden = cupy.arange(1, _ELLIPDEG_MMAX + 2)
-
-    num = (q ** (mnum * (mnum+1))).sum()
-    den = 1 + 2 * (q ** (mden**2)).sum()
+    num = sum(q ** e for e in _ELLIPDEG_NUM_EXPONENTS)
+    den = 1 + 2 * sum(q ** e for e in _ELLIPDEG_DEN_EXPONENTS)
 
     return 16 * q * (num / den) ** 4
 
@@ -1003,6 +1258,11 @@ def _arc_jac_sn(w, m):
            https://www.ece.rutgers.edu/~orfanidi/ece521/notes.pdf
 
     """
+    # This is a purely scalar recursion: run it on the host, so that no
+    # kernel is launched per iteration.
+    w = complex(w)
+    m = float(m)
+
     # Maximum number of iterations in Landen transformation recursion
     # sequence.  10 is conservative; unit tests pass with 4, Orfanidis
     # (see _arc_jac_cn [1]) suggests 5.
@@ -1016,9 +1276,9 @@ def _arc_jac_sn(w, m):
     k = m ** 0.5
 
     if k > 1:
-        return cupy.nan
+        return cmath.nan
     elif k == 1:
-        return cupy.arctanh(w)
+        return cmath.atanh(w)
 
     ks = [k]
     niter = 0
@@ -1030,7 +1290,7 @@ def _arc_jac_sn(w, m):
         if niter > _ARC_JAC_SN_MAXITER:
             raise ValueError('Landen transformation not converging')
 
-    K = cupy.prod(1 + cupy.array(ks[1:])) * pi/2
+    K = math.prod(1 + kn for kn in ks[1:]) * pi/2
 
     wns = [w]
 
@@ -1040,7 +1300,7 @@ def _arc_jac_sn(w, m):
                  ((1 + knext) * (1 + _complement(kn * wn))))
         wns.append(wnext)
 
-    u = 2 / pi * cupy.arcsin(wns[-1])
+    u = 2 / pi * cmath.asin(wns[-1])
 
     z = K * u
     return z
@@ -1068,6 +1328,188 @@ def _arc_jac_sc1(w, m):
     return zcomplex.imag
 
 
+# Levels of the AGM scale in cephes' ellpj, which
+# cupyx.scipy.special.ellipj follows
+_ELLIPJ_AGM_LEVELS = 8
+
+_MACHEP = 2.0 ** -53
+
+
+def _ellipj_agm_table(m):
+    """AGM scale of ``ellipj`` for the parameter ``m``, on the host
+
+    Returns ``[2**L * a[L], c[1], a[1], ..., c[L], a[L]]`` for the
+    ``L = _ELLIPJ_AGM_LEVELS`` levels of the cephes recursion.  Levels past
+    convergence are padded with ``c = 0``, where the backward recurrence
+    is an exact halving, so every lane runs the same number of steps.
+    """
+    a, c = [1.0], [math.sqrt(m)]
+    b = math.sqrt(1.0 - m)
+    while abs(c[-1] / a[-1]) > _MACHEP and len(a) <= _ELLIPJ_AGM_LEVELS:
+        ai = a[-1]
+        c.append((ai - b) / 2.0)
+        a.append((ai + b) / 2.0)
+        b = math.sqrt(ai * b)
+
+    pad = _ELLIPJ_AGM_LEVELS + 1 - len(a)
+    a += [a[-1]] * pad
+    c += [0.0] * pad
+
+    table = [2.0 ** _ELLIPJ_AGM_LEVELS * a[-1]]
+    for cl, al in zip(c[1:], a[1:]):
+        table += [cl, al]
+    return table
+
+
+_ellipj_agm_kernel = cupy.ElementwiseKernel(
+    'float64 u, float64 m, raw float64 table, int32 width',
+    'float64 sn, float64 cn, float64 dn',
+    """
+    const int L = %d;
+    const double* ac = &table[(i / width) * (2 * L + 1)];
+    double phi = ac[0] * u;
+    double b = phi;
+    for (int l = L; l > 0; --l) {
+        b = phi;
+        phi = (asin(ac[2 * l - 1] * sin(phi) / ac[2 * l]) + phi) / 2.0;
+    }
+    sn = sin(phi);
+    double t = cos(phi);
+    cn = t;
+    double dnfac = cos(phi - b);
+    // See discussion after DLMF 22.20.5
+    dn = fabs(dnfac) < 0.1 ? sqrt(1 - m * sn * sn) : t / dnfac;
+    """ % _ELLIPJ_AGM_LEVELS,
+    'cupyx_scipy_signal_ellipj_agm')
+
+
+def _ellipj_agm(u, m):
+    """sn, cn and dn of ``ellipj(u, m)``, with the AGM scale on the host
+
+    ``m`` is a host scalar shared by all of ``u``, or a host sequence with
+    one parameter per row of a 2-D ``u``.  The AGM scale only depends on
+    ``m``, so it is computed once per parameter instead of once per
+    element, and the kernel only runs the backward recurrence.
+    """
+    m = numpy.atleast_1d(numpy.asarray(m, dtype=float))
+    if m.size == 1:
+        m_arg, width = float(m[0]), max(u.size, 1)
+    else:
+        m_arg, width = cupy.asarray(m)[:, None], u.shape[-1]
+
+    if ((m < 1e-9) | (m >= 0.9999999999)).any():
+        # the limiting series of cephes are left to the generic ufunc
+        s, c, d, phi = special.ellipj(u, m_arg)
+        return s, c, d
+
+    table = cupy.asarray(numpy.array([_ellipj_agm_table(m_) for m_ in m]))
+    return _ellipj_agm_kernel(u, m_arg, table, width)
+
+
+_mirror_conj_kernel = cupy.ElementwiseKernel(
+    'complex128 x, int32 n, int32 first',
+    'raw complex128 out',
+    """
+    ptrdiff_t row = i / n, col = i % n, w = 2 * n - first;
+    out[row * w + col] = x;
+    if (col >= first) {
+        out[row * w + n + col - first] = conj(x);
+    }
+    """,
+    'cupyx_scipy_signal_mirror_conj')
+
+
+def _mirror_conj(x, first=0):
+    """``concatenate((x, x[..., first:].conj()), axis=-1)`` in one kernel
+
+    The output is allocated once and each input element writes both its
+    copy and its mirrored conjugate.
+    """
+    n = x.shape[-1]
+    out = cupy.empty(x.shape[:-1] + (2 * n - first,), dtype=cupy.complex128)
+    _mirror_conj_kernel(x, n, first, out)
+    return out
+
+
+@cupy.fuse()
+def _build_zp(s, c, d, sv, cv, dv, sqrt_m):
+    # Zeros and poles of the device fallback of ellipap in one kernel.
+    # The zeros are formed on every lane; the caller drops the one with
+    # a vanishing ``s``.
+    z = 1j / (sqrt_m * s)
+    dsv = d * sv
+    p = -(c * d * sv * cv + 1j * s * dv) / (1.0 - dsv * dsv)
+    return z, p
+
+
+def _ellip_gain(z, p, axis=-1):
+    """Gain ``prod(-p) / prod(-z)`` of an elliptic prototype, as a log-sum.
+
+    The poles are in the left half-plane and the zeros are conjugate pairs
+    on the imaginary axis, so the ratio is real and positive and only the
+    magnitudes are needed; summing their logarithms cannot overflow for
+    high orders the way the products can.
+    """
+    xp = cupy.get_array_module(z, p)
+    return xp.exp(xp.log(abs(p)).sum(axis=axis) -
+                  xp.log(abs(z)).sum(axis=axis))
+
+
+# Orders up to which ellipap runs on the host.  The prototype only has
+# O(N) roots, far too few to amortize the kernel launches of the device
+# path, which is kept as a fallback for very high orders.
+_ELLIPAP_HOST_MAX_ORDER = 64
+
+
+@functools.lru_cache(maxsize=256)
+def _ellipap_numpy(N, rp, rs):
+    """Host implementation of ellipap for N >= 2, using NumPy and SciPy.
+
+    The design only depends on ``(N, rp, rs)``, which iterative design
+    loops call repeatedly, so it is cached; the cache is bounded since
+    ripple sweeps produce many distinct keys. The returned zeros and poles
+    are read-only.
+    """
+    eps_sq = _pow10m1(0.1 * rp)
+
+    eps = math.sqrt(eps_sq)
+    ck1_sq = eps_sq / _pow10m1(0.1 * rs)
+    if ck1_sq == 0:
+        raise ValueError("Cannot design a filter with given rp and rs"
+                         " specifications.")
+
+    m = _ellipdeg(N, ck1_sq)
+    capk = _ellipk_agm(1 - m)
+    j = numpy.arange(1 - N % 2, N, 2)
+    EPSILON = 2e-16
+
+    s, c, d, phi = scipy.special.ellipj(j * capk / N, m)
+    snew = numpy.compress(abs(s) > EPSILON, s, axis=-1)
+    z = 1.j / (math.sqrt(m) * snew)
+    z = numpy.concatenate((z, z.conj()))
+
+    r = _arc_jac_sc1(1. / eps, ck1_sq)
+    v0 = capk * r / (N * _ellipk_agm(1 - ck1_sq))
+
+    sv, cv, dv, phi = scipy.special.ellipj(v0, 1 - m)
+    p = -(c * d * sv * cv + 1j * s * dv) / (1 - (d * sv) ** 2.0)
+
+    if N % 2:
+        mask = abs(p.imag) > EPSILON * float(numpy.linalg.norm(p))
+        newp = numpy.compress(mask, p, axis=-1)
+        p = numpy.concatenate((p, newp.conj()))
+    else:
+        p = numpy.concatenate((p, p.conj()))
+
+    k = _ellip_gain(z, p)
+    if N % 2 == 0:
+        k = k / math.sqrt(1 + eps_sq)
+
+    z.flags.writeable = False
+    p.flags.writeable = False
+    return z, p, float(k)
+
+
 def ellipap(N, rp, rs):
     """Return (z,p,k) of Nth-order elliptic analog lowpass filter.
 
@@ -1091,52 +1533,121 @@ def ellipap(N, rp, rs):
            https://www.ece.rutgers.edu/~orfanidi/ece521/notes.pdf
 
     """
-    if abs(int(N)) != N:
+    # integers pass without conversions; integral floats, such as 3.0, are
+    # still accepted like in SciPy
+    if not (isinstance(N, (int, numpy.integer)) and N >= 0) and \
+            abs(int(N)) != N:
         raise ValueError("Filter order must be a nonnegative integer")
-    elif N == 0:
+
+    # plain Python scalars, which also make hashable keys for the cache
+    N, rp, rs = int(N), float(rp), float(rs)
+
+    if N == 0:
         # Avoid divide-by-zero warning
         # Even order filters have DC gain of -rp dB
-        return cupy.array([]), cupy.array([]), 10**(-rp/20)
+        # (empty arrays need no device allocation nor host conversion)
+        return cupy.empty(0), cupy.empty(0), math.pow(10, -rp / 20)
     elif N == 1:
-        p = -cupy.sqrt(1.0 / _pow10m1(0.1 * rp))
+        p = -math.sqrt(1.0 / _pow10m1(0.1 * rp))
         k = -p
-        z = []
+        return cupy.empty(0), cupy.asarray(p), k
+
+    if _scipy_available and N <= _ELLIPAP_HOST_MAX_ORDER:
+        z, p, k = _ellipap_numpy(N, rp, rs)
         return cupy.asarray(z), cupy.asarray(p), k
 
     eps_sq = _pow10m1(0.1 * rp)
 
-    eps = cupy.sqrt(eps_sq)
+    eps = math.sqrt(eps_sq)
     ck1_sq = eps_sq / _pow10m1(0.1 * rs)
     if ck1_sq == 0:
         raise ValueError("Cannot design a filter with given rp and rs"
                          " specifications.")
 
     m = _ellipdeg(N, ck1_sq)
-    capk = special.ellipk(m)
-    j = cupy.arange(1 - N % 2, N, 2)
-    EPSILON = 2e-16
-
-    s, c, d, phi = special.ellipj(j * capk / N, m * cupy.ones_like(j))
-    snew = cupy.compress(abs(s) > EPSILON, s, axis=-1)
-    z = 1.j / (cupy.sqrt(m) * snew)
-    z = cupy.concatenate((z, z.conj()))
+    capk = _ellipk_agm(1 - m)
+    j = numpy.arange(1 - N % 2, N, 2)
+    u = cupy.asarray(j * capk / N)
 
+    s, c, d = _ellipj_agm(u, m)
     r = _arc_jac_sc1(1. / eps, ck1_sq)
-    v0 = capk * r / (N * special.ellipk(ck1_sq))
+    v0 = capk * r / (N * _ellipk_agm(1 - ck1_sq))
 
     sv, cv, dv, phi = special.ellipj(v0, 1 - m)
-    p = -(c * d * sv * cv + 1j * s * dv) / (1 - (d * sv) ** 2.0)
+    z, p = _build_zp(s, c, d, sv, cv, dv, math.sqrt(m))
 
-    if N % 2:
-        mask = abs(p.imag) > EPSILON * \
-            cupy.sqrt((p * p.conj()).sum(axis=0).real)
-        newp = cupy.compress(mask, p, axis=-1)
-        p = cupy.concatenate((p, newp.conj()))
-    else:
-        p = cupy.concatenate((p, p.conj()))
+    # As in _ellipap_batched, lane j = 0 of odd orders holds no zero and
+    # the real pole; slicing it off the poles as well, rather than
+    # compressing on |p.imag|, keeps all sizes static without a sync.
+    first = N % 2
+
+    z = _mirror_conj(z[first:])
+    p = _mirror_conj(p, first)
+
+    # z and p hold at most 2N values: form the gain on the host
+    z_h, p_h = cupy.asnumpy(z), cupy.asnumpy(p)
+    k = float(_ellip_gain(z_h, p_h))
+    if N % 2 == 0:
+        k = k / math.sqrt(1 + eps_sq)
+
+    return z, p, k
+
+
+def _ellipap_batched(N, rp, rs):
+    """Batched version of `ellipap` over ripples; gains are on the device.
+
+    All ``F`` designs share the order ``N`` while ``rp`` and ``rs`` are
+    host scalars or length ``F`` sequences, so that zeros and poles come
+    out as ``(F, Nz)`` and ``(F, Np)`` arrays like the batched zpk
+    transforms, and ripple sweeps evaluate ``ellipj`` only once.
+    """
+    if not (isinstance(N, (int, numpy.integer)) and N >= 0) and \
+            abs(int(N)) != N:
+        raise ValueError("Filter order must be a nonnegative integer")
+    rp, rs = numpy.broadcast_arrays(numpy.atleast_1d(rp).astype(float),
+                                    numpy.atleast_1d(rs).astype(float))
+    F = rp.size
+
+    if N == 0:
+        return (cupy.empty((F, 0)), cupy.empty((F, 0)),
+                cupy.asarray(10**(-rp/20)))
+    elif N == 1:
+        p = -numpy.sqrt(1.0 / numpy.expm1(_POW10_LOG10 * 0.1 * rp))
+        return (cupy.empty((F, 0)), cupy.asarray(p[:, None]),
+                cupy.asarray(-p))
+
+    eps_sq = numpy.expm1(_POW10_LOG10 * 0.1 * rp)
+
+    eps = numpy.sqrt(eps_sq)
+    ck1_sq = eps_sq / numpy.expm1(_POW10_LOG10 * 0.1 * rs)
+    if not ck1_sq.all():
+        raise ValueError("Cannot design a filter with given rp and rs"
+                         " specifications.")
 
-    k = (cupy.prod(-p, axis=0) / cupy.prod(-z, axis=0)).real
+    # The degree equation and the inverse sc are scalar iterations: solve
+    # them per design on the host, and batch the array work on the device
+    m = numpy.array([_ellipdeg(N, c) for c in ck1_sq])
+    capk = numpy.array([_ellipk_agm(1 - m_) for m_ in m])
+    r = numpy.array([_arc_jac_sc1(1. / e, c) for e, c in zip(eps, ck1_sq)])
+    v0 = capk * r / (N * numpy.array([_ellipk_agm(1 - c) for c in ck1_sq]))
+
+    j = numpy.arange(1 - N % 2, N, 2)
+    u = cupy.asarray(j * capk[:, None] / N)
+    m_d = cupy.asarray(m)
+
+    s, c, d = _ellipj_agm(u, m)
+    sv, cv, dv, phi = special.ellipj(cupy.asarray(v0), 1 - m_d)
+    z, p = _build_zp(s, c, d, sv[:, None], cv[:, None], dv[:, None],
+                     cupy.sqrt(m_d)[:, None])
+
+    # For odd orders, the first column is j = 0: s vanishes there, which
+    # gives no zero and the one real pole, for every design
+    first = N % 2
+    z = _mirror_conj(z[:, first:])
+    p = _mirror_conj(p, first)
+
+    k = _ellip_gain(z, p, axis=1)
     if N % 2 == 0:
-        k = k / cupy.sqrt(1 + eps_sq)
+        k = k / cupy.asarray(numpy.sqrt(1 + eps_sq))
 
     return z, p, k
@@ -1,13 +1,16 @@
 
+import warnings
 from math import sqrt, pi
 
 import cupy
 import cupyx.scipy.signal as signal
+from cupyx.scipy.signal import _iir_filter_conversions as _iir
 from cupy import testing
 from cupy.testing import assert_array_almost_equal
 
 import numpy as np
 
+import pytest
 from pytest import raises as assert_raises
 
 
@@ -32,6 +35,23 @@ class TestBilinear_zpk:
         assert_allclose(k_d, 9696/69803)
         """
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_real_poles(self, xp, scp):
+        z = []
+        p = [-1, -2]
+        k = 3
+        z_d, p_d, k_d = scp.signal.bilinear_zpk(z, p, k, 10)
+        return z_d, p_d, k_d
+
+    @pytest.mark.parametrize('dtype', [np.float32, np.complex64])
+    @testing.numpy_cupy_allclose(scipy_name="scp", rtol=1e-6)
+    def test_single_precision(self, xp, scp, dtype):
+        z = xp.asarray([-2, 0.5], dtype=dtype)
+        p = xp.asarray([-0.75, -0.5, -3], dtype=dtype)
+
+        z_d, p_d, k_d = scp.signal.bilinear_zpk(z, p, 3, 10)
+        return z_d, p_d
+
 
 @testing.with_requires("scipy")
 class TestBilinear:
@@ -59,6 +79,22 @@ class TestBilinear:
 #        assert_array_almost_equal(a_z, [1, -1.2158, 0.72826],
 #                                  decimal=4)
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_high_order(self, xp, scp):
+        b = [1, 2, 3, 4]
+        a = [1, 3, 3, 1, 4, 5, 6]
+        b_z, a_z = scp.signal.bilinear(b, a, 10)
+        return b_z, a_z
+
+    @testing.numpy_cupy_allclose(scipy_name="scp", rtol=1e-12)
+    def test_beyond_kernel_order(self, xp, scp):
+        # orders above the kernel limit go through the matrix product
+        M = _iir._BILINEAR_KERNEL_MAX_ORDER + 8
+        b = [1, 2, 3, 4]
+        a = np.poly(-np.linspace(0.5, 2, M)).tolist()
+        b_z, a_z = scp.signal.bilinear(b, a, 10)
+        return b_z, a_z
+
 
 @testing.with_requires("scipy")
 class TestNormalize:
@@ -110,6 +146,23 @@ class TestNormalize:
         assert_array_almost_equal(b_matlab, b_output, decimal=13)
         assert_array_almost_equal(a_matlab, a_output, decimal=13)
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_leading_zeros(self, xp, scp):
+        b = xp.array([[0, 0, 1, 2], [0, 1e-15, 3, 4]])
+        a = xp.array([2, 4])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            b_n, a_n = scp.signal.normalize(b, a)
+        return b_n, a_n
+
+    def test_ragged_numerators(self):
+        b = [[1, 2], [3, 4, 5, 6], [7]]
+        b_n, a_n = signal.normalize(b, [2, 4])
+        testing.assert_allclose(b_n, [[0, 0, 0.5, 1],
+                                      [1.5, 2, 2.5, 3],
+                                      [0, 0, 0, 3.5]])
+        testing.assert_allclose(a_n, [1, 2])
+
     def test_errors(self):
         """Test the error cases."""
         # all zero denominator
@@ -154,6 +207,21 @@ class TestLp2bp:
         b_bp, a_bp = scp.signal.lp2bp(b, a, 2*pi*4000, 2*pi*2000)
         return b_bp, a_bp
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_basic_2(self, xp, scp):
+        b = [2, 1]
+        a = [1, 3, 3, 2]
+        b_bp, a_bp = scp.signal.lp2bp(b, a, 3, 2)
+        return b_bp, a_bp
+
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_trailing_zeros(self, xp, scp):
+        # the transformed denominator ends in a zero, which must be kept
+        b = [1, 3, 2]
+        a = [1, 2]
+        b_bp, a_bp = scp.signal.lp2bp(b, a, 3, 2)
+        return b_bp, a_bp
+
 
 @testing.with_requires("scipy")
 class TestLp2bs:
@@ -166,6 +234,13 @@ class TestLp2bs:
             b, a, 0.41722257286366754, 0.18460575326152251)
         return b_bs, a_bs
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_basic_2(self, xp, scp):
+        b = [2, 1]
+        a = [1, 3, 3, 2]
+        b_bs, a_bs = scp.signal.lp2bs(b, a, 3, 2)
+        return b_bs, a_bs
+
 
 @testing.with_requires("scipy")
 class TestLp2lp_zpk:
@@ -221,6 +296,22 @@ class TestLp2bp_zpk:
         z_bp, p_bp, k_bp = scp.signal.lp2bp_zpk(z, p, k, 15, 8)
         return z_bp, p_bp, k_bp
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_real(self, xp, scp):
+        z = [1., -2., 3.]
+        p = [-3., -4., -1., -0.2]
+        k = 2
+        z_bp, p_bp, k_bp = scp.signal.lp2bp_zpk(z, p, k, 15, 8)
+        return z_bp, p_bp, k_bp
+
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_real_precision(self, xp, scp, dtype):
+        z = xp.asarray([1., -2., 3.], dtype=dtype)
+        p = xp.asarray([-3., -4., -1., -0.2], dtype=dtype)
+        z_bp, p_bp, k_bp = scp.signal.lp2bp_zpk(z, p, 2, 15, 8)
+        return z_bp, p_bp
+
 
 @testing.with_requires("scipy")
 class TestLp2bs_zpk:
@@ -238,6 +329,22 @@ class TestLp2bs_zpk:
         p_bs_s = p_bs[xp.argsort(p_bs.imag)]
         return z_bs_s, p_bs_s, k_bs
 
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_real(self, xp, scp):
+        z = [1., -2., 3.]
+        p = [-3., -4., -1., -0.2]
+        k = 2
+        z_bs, p_bs, k_bs = scp.signal.lp2bs_zpk(z, p, k, 15, 8)
+        return z_bs, p_bs, k_bs
+
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64])
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_real_precision(self, xp, scp, dtype):
+        z = xp.asarray([1., -2., 3.], dtype=dtype)
+        p = xp.asarray([-3., -4., -1., -0.2], dtype=dtype)
+        z_bs, p_bs, k_bs = scp.signal.lp2bs_zpk(z, p, 2, 15, 8)
+        return z_bs, p_bs
+
 
 @testing.with_requires("scipy")
 class TestLowLevelAP:
@@ -256,3 +363,82 @@ class TestLowLevelAP:
     @testing.numpy_cupy_allclose(scipy_name="scp", atol=2e-4, rtol=2e-4)
     def test_ellipap(self, xp, scp):
         return scp.signal.ellipap(7, 1, 10)
+
+    @testing.numpy_cupy_allclose(scipy_name="scp", atol=2e-4, rtol=2e-4)
+    def test_ellipap_even(self, xp, scp):
+        return scp.signal.ellipap(6, 0.5, 40)
+
+    @testing.numpy_cupy_allclose(scipy_name="scp", atol=2e-4, rtol=2e-4)
+    def test_ellipap_array_ripples(self, xp, scp):
+        return scp.signal.ellipap(4, xp.asarray(1.0), xp.asarray(40.0))
+
+    @pytest.mark.parametrize('N, rp, rs', [
+        (1, 1, 10), (2, 0.5, 40), (7, 1, 10), (8, 0.1, 60),
+        (66, 1, 40), (71, 0.5, 80),
+    ])
+    # recent SciPy returns complex arrays for N == 1, older releases real
+    @testing.numpy_cupy_allclose(scipy_name="scp", atol=2e-4, rtol=2e-4,
+                                 type_check=False)
+    def test_ellipap_device(self, xp, scp, monkeypatch, N, rp, rs):
+        # without SciPy, cupyx designs the prototype on the device
+        monkeypatch.setattr(_iir, '_scipy_available', False)
+        return scp.signal.ellipap(N, rp, rs)
+
+    # 1e-12 and 1 - 1e-11 fall back to special.ellipj, the others are
+    # inside the range of the AGM kernel, down to its thresholds
+    @pytest.mark.parametrize('m', [
+        1e-12, 2e-9, 0.01, 0.5, 0.999, 1 - 2e-10, 1 - 1e-11])
+    @testing.numpy_cupy_allclose(scipy_name="scp", atol=1e-14)
+    def test_ellipj_agm(self, xp, scp, m):
+        u = xp.linspace(-4, 4, 17)
+        if xp is np:
+            return scp.special.ellipj(u, m)[:3]
+        return _iir._ellipj_agm(u, m)
+
+    @testing.numpy_cupy_allclose(scipy_name="scp", atol=1e-14)
+    def test_ellipj_agm_per_row(self, xp, scp):
+        u = xp.linspace(-3, 3, 24).reshape(3, 8)
+        m = [2e-9, 0.5, 1 - 2e-10]
+        if xp is np:
+            return scp.special.ellipj(u, np.array(m)[:, None])[:3]
+        return _iir._ellipj_agm(u, m)
+
+
+class TestZpkBatched:
+
+    @pytest.mark.parametrize('name, args', [
+        ('bilinear_zpk', (10,)),
+        ('lp2lp_zpk', (3,)),
+        ('lp2hp_zpk', (3,)),
+    ])
+    @pytest.mark.parametrize('nz, np_', [(0, 4), (2, 3), (3, 3)])
+    @pytest.mark.parametrize('shared_z', [False, True])
+    def test_matches_loop(self, name, args, nz, np_, shared_z):
+        # shared_z: one 1-D set of zeros for all the filters
+        z_shape = (nz,) if shared_z else (5, nz)
+        z = testing.shaped_random(z_shape, cupy, cupy.complex128)
+        p = -testing.shaped_random((5, np_), cupy, cupy.complex128)
+        k = testing.shaped_random((5,), cupy, cupy.float64)
+
+        batched = getattr(_iir, '_' + name + '_batched')
+        z_b, p_b, k_b = batched(z, p, k, *args)
+        assert z_b.shape[0] == 5
+
+        for f in range(5):
+            z_f, p_f, k_f = getattr(signal, name)(z if shared_z else z[f],
+                                                  p[f], float(k[f]), *args)
+            testing.assert_allclose(z_b[f], z_f)
+            testing.assert_allclose(p_b[f], p_f)
+            testing.assert_allclose(k_b[f], k_f)
+
+    @pytest.mark.parametrize('N', [0, 1, 4, 7])
+    def test_ellipap_matches_loop(self, N):
+        rp = [0.5, 1, 3]
+        rs = [40, 20, 60]
+        z_b, p_b, k_b = _iir._ellipap_batched(N, rp, rs)
+
+        for f in range(3):
+            z_f, p_f, k_f = signal.ellipap(N, rp[f], rs[f])
+            testing.assert_allclose(z_b[f], z_f.ravel())
+            testing.assert_allclose(p_b[f], p_f.ravel())
+            testing.assert_allclose(k_b[f], k_f)